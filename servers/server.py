@@ -6,21 +6,41 @@ import re
 import string
 import sys
 import json
+import time
+import atexit
+import queue
 import logging
-import textwrap
-import tempfile
+from logging.handlers import QueueHandler, QueueListener
+import threading
 import subprocess
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict
 
 from pyats.topology import loader
 from genie.libs.parser.utils import get_parser
 from dotenv import load_dotenv
 import asyncio
-from functools import partial
+from functools import lru_cache
 
 from mcp.server.fastmcp import FastMCP
 import tiktoken
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from toon_format import encode as toon_encode
+except ImportError:
+    toon_encode = None
+
+try:
+    import xmltodict
+except ImportError:
+    xmltodict = None
+
 
 # ================================================================
 # LOGGING — MUST BE STDERR ONLY
@@ -33,6 +53,16 @@ logging.basicConfig(
 logger = logging.getLogger("PyATSFastMCPServer")
 logger.setLevel(logging.INFO)   # <── FORCE INFO LOGS TO APPEAR
 
+# Route records through a queue so stderr formatting/flushing happens on a
+# background thread instead of blocking the event loop or executor threads.
+_LOG_QUEUE = queue.SimpleQueue()
+_LOG_LISTENER = QueueListener(
+    _LOG_QUEUE, *logging.getLogger().handlers, respect_handler_level=True
+)
+logging.getLogger().handlers = [QueueHandler(_LOG_QUEUE)]
+_LOG_LISTENER.start()
+atexit.register(_LOG_LISTENER.stop)
+
 
 # ================================================================
 # ENV + TESTBED
@@ -50,83 +80,271 @@ logger.info(f"✅ Using testbed file: {TESTBED_PATH}")
 # ================================================================
 # TOKENIZER (optional but great)
 # ================================================================
-try:
-    tokenizer = tiktoken.get_encoding("o200k_base")
-    logger.info("🧮 Loaded GPT o200k_base tokenizer for token savings reporting")
-except Exception:
-    tokenizer = None
+# Keep the BPE merges on local disk so the vocab is never re-downloaded.
+os.environ.setdefault("TIKTOKEN_CACHE_DIR", "/tmp/tiktoken_cache")
+
+
+@lru_cache(maxsize=1)
+def _get_tokenizer():
+    try:
+        enc = tiktoken.get_encoding("o200k_base")
+        logger.info("🧮 Loaded GPT o200k_base tokenizer for token savings reporting")
+        return enc
+    except Exception:
+        return None
 
 
-def count_tokens(text: str) -> int:
+def count_tokens_batch(texts: list, num_threads: int = 2) -> list:
+    """Tokenize several strings in one FFI call (tiktoken parallelizes internally)."""
+    tokenizer = _get_tokenizer()
     if tokenizer is None:
-        return -1
+        return [-1] * len(texts)
     try:
-        return len(tokenizer.encode(text))
+        encoded = tokenizer.encode_ordinary_batch(texts, num_threads=num_threads)
+        return [len(ids) for ids in encoded]
     except Exception:
-        return -1
+        return [-1] * len(texts)
+
+
+# ----------------------------------------------------------------
+# Token-count coalescer: concurrent tool calls funnel their strings
+# into one queue so a single encode_ordinary_batch covers them all.
+# ----------------------------------------------------------------
+_TOKEN_BATCH_WINDOW = 0.005   # seconds to wait for more strings
+_TOKEN_BATCH_MAX = 16
+
+_token_queue: "asyncio.Queue" = None
+_token_batcher_task = None
+
+
+async def _token_batcher():
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _token_queue.get()]
+        deadline = loop.time() + _TOKEN_BATCH_WINDOW
+        while len(batch) < _TOKEN_BATCH_MAX:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_token_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        texts = [text for text, _ in batch]
+        try:
+            counts = await asyncio.to_thread(count_tokens_batch, texts, 4)
+        except Exception:
+            counts = [-1] * len(texts)
+
+        for (_, future), count in zip(batch, counts):
+            if not future.done():
+                future.set_result(count)
+
+
+# Opt-out switch for the savings report, plus a size ceiling above which an
+# exact BPE count is not worth the CPU and a bytes/4 estimate is close enough.
+_REPORT_TOKENS = os.getenv("TOON_REPORT_TOKENS", "1").lower() not in ("0", "false", "no")
+_APPROX_TOKEN_THRESHOLD = 64 * 1024
+
+
+async def _count_or_estimate(text: str) -> int:
+    if len(text) > _APPROX_TOKEN_THRESHOLD:
+        # ~4 bytes per token for GPT-family encodings — plenty for a ratio.
+        return len(text) // 4
+    return await _batched_count(text)
+
+
+async def _batched_count(text: str) -> int:
+    """Queue a string for coalesced tokenization and await its token count."""
+    global _token_queue, _token_batcher_task
+    if _token_queue is None:
+        _token_queue = asyncio.Queue()
+    if _token_batcher_task is None or _token_batcher_task.done():
+        _token_batcher_task = asyncio.create_task(_token_batcher())
+
+    future = asyncio.get_running_loop().create_future()
+    await _token_queue.put((text, future))
+    return await future
 
 
 # ================================================================
 # SAFE JSON NORMALIZATION
 # ================================================================
+# The overwhelmingly common case in genie parser output — handled without
+# any copying or json.dumps probing.
+_JSON_PRIMITIVES = (str, int, float, bool, type(None))
+
+
 def make_json_safe(obj: Any) -> Any:
-    if isinstance(obj, dict):
-        return {str(k): make_json_safe(v) for k, v in obj.items()}
-    if isinstance(obj, (list, tuple)):
-        return [make_json_safe(v) for v in obj]
-    if isinstance(obj, set):
-        return sorted([make_json_safe(v) for v in obj], key=lambda x: str(x))
-    if hasattr(obj, "__dict__"):
-        return make_json_safe(obj.__dict__)
-    try:
-        json.dumps(obj)
+    """Normalize arbitrary pyATS objects into JSON-serializable structures.
+
+    Iterative (stack-based) so deeply nested parsed configs cannot hit the
+    recursion limit, with fast paths that reuse subtrees which are already
+    JSON-safe instead of rebuilding them.
+    """
+    if isinstance(obj, _JSON_PRIMITIVES):
         return obj
-    except Exception:
-        return str(obj)
+
+    # Whole-tree scan: parser output is almost always already-safe
+    # dict/list/primitive, so one read-only pass usually avoids the copy.
+    # _is_json_safe (not a json.dumps probe) so tuples and non-str keys —
+    # which stdlib json would accept but coerce — still get normalized.
+    if _is_json_safe(obj):
+        return obj
+
+    root = [None]
+    stack = [(root, 0, obj)]
+    while stack:
+        parent, key, value = stack.pop()
+
+        if isinstance(value, _JSON_PRIMITIVES):
+            parent[key] = value
+        elif isinstance(value, dict):
+            if all(
+                type(k) is str and isinstance(v, _JSON_PRIMITIVES)
+                for k, v in value.items()
+            ):
+                # Flat, already-safe dict — reuse it as-is.
+                parent[key] = value
+            else:
+                new: Dict[str, Any] = {}
+                parent[key] = new
+                for k, v in value.items():
+                    sk = k if type(k) is str else str(k)
+                    new[sk] = None
+                    stack.append((new, sk, v))
+        elif isinstance(value, (list, tuple)):
+            new_list = [None] * len(value)
+            parent[key] = new_list
+            for i, v in enumerate(value):
+                stack.append((new_list, i, v))
+        elif isinstance(value, set):
+            # Sets are rare and shallow — convert members eagerly so the
+            # sorted order reflects their JSON-safe form.
+            parent[key] = sorted((make_json_safe(v) for v in value), key=str)
+        elif hasattr(value, "__dict__"):
+            stack.append((parent, key, value.__dict__))
+        else:
+            try:
+                json.dumps(value)
+                parent[key] = value
+            except Exception:
+                parent[key] = str(value)
+
+    return root[0]
+
+
+def _is_json_safe(obj: Any) -> bool:
+    """One-pass scan for trees that are already JSON-serializable.
+
+    device.parse() output is plain dict/list/primitive, so the scan almost
+    always succeeds and the normalization copy can be skipped entirely.
+    """
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, _JSON_PRIMITIVES):
+            continue
+        if isinstance(value, dict):
+            for k, v in value.items():
+                if type(k) is not str:
+                    return False
+                stack.append(v)
+        elif isinstance(value, list):
+            stack.extend(value)
+        else:
+            return False
+    return True
+
+
+def _json_default(obj: Any) -> Any:
+    """Inline fallback for non-native leaves, so the encoder can walk the
+    original tree once instead of a fully normalized copy."""
+    if isinstance(obj, tuple):
+        return list(obj)
+    if isinstance(obj, (set, frozenset)):
+        return sorted((make_json_safe(v) for v in obj), key=str)
+    if hasattr(obj, "__dict__"):
+        return obj.__dict__
+    return str(obj)
+
+
+def _json_dumps(obj: Any) -> str:
+    """Compact JSON serialization, using orjson's Rust encoder when available."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_NON_STR_KEYS, default=_json_default
+        ).decode()
+    return json.dumps(obj, default=_json_default)
 
 
 # ================================================================
 # TOON CONVERSION (via npx)
 # ================================================================
-def toon_with_stats(data: Any) -> str:
+def _toon_via_cli(json_str: str) -> str:
+    """Convert JSON to TOON via the npx CLI — fallback when the Python
+    toon_format package is unavailable. Raises on any failure."""
+    cmd = ["npx", "@toon-format/cli", "-"]
+    # Lazy %s formatting — skipped entirely when the level is filtered.
+    logger.debug("[TOON] Running: %s", cmd)
+
+    result = subprocess.run(cmd, input=json_str, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"TOON CLI failed:\n{result.stderr}")
+
+    return result.stdout
+
+
+async def toon_with_stats(data: Any) -> str:
     """
     Take any Python object (result dicts from pyATS helpers),
     normalize to JSON, run TOON, and append token savings stats.
     """
-    safe = make_json_safe(data)
-    json_str = json.dumps(safe, indent=2)
+    # Raw text payloads (show logging, show run, completed_raw fallbacks)
+    # gain nothing from TOON — return them directly and skip the encoder
+    # plus both tokenizer passes. Only completed_raw results qualify; other
+    # envelopes with string output (e.g. config success) keep their fields.
+    if isinstance(data, dict) and data.get("status") == "completed_raw":
+        output = data.get("output")
+        if isinstance(output, dict) and set(output.keys()) == {"raw_output"}:
+            output = output["raw_output"]
+        if isinstance(output, str):
+            return f"```\n{output}\n```"
+
+    if _is_json_safe(data):
+        safe = data
+    elif toon_encode is not None:
+        # The in-process TOON encoder needs a normalized tree.
+        safe = make_json_safe(data)
+    else:
+        # CLI fallback only consumes the JSON string — serialize straight
+        # from the original tree and let _json_default convert odd leaves.
+        safe = None
+
+    # The JSON string only feeds the CLI fallback, error envelopes, and the
+    # savings stats — on the in-process path with stats off it is never
+    # materialized at all, keeping peak memory at one copy of the payload.
+    json_str = None
+    if toon_encode is None:
+        # Compact on purpose: indentation only pads the token counts and
+        # the TOON encoder does not care about whitespace.
+        json_str = _json_dumps(data if safe is None else safe)
 
     # ------------------------------------------------------------------
-    # Run TOON CLI via NPX
+    # TOON conversion — in-process encoder, npx CLI only as fallback
     # ------------------------------------------------------------------
     try:
-        with tempfile.NamedTemporaryFile(mode="w+", suffix=".json", delete=False) as f_json:
-            f_json.write(json_str)
-            f_json.flush()
-            src = f_json.name
-            dst = f_json.name + ".toon"
-
-        cmd = ["npx", "@toon-format/cli", src, "-o", dst]
-        logger.info(f"[TOON] Running: {' '.join(cmd)}")
-
-        result = subprocess.run(cmd, capture_output=True, text=True)
-
-        if result.returncode != 0:
-            return (
-                "```error\n"
-                f"TOON CLI failed:\n{result.stderr}\n\n"
-                "JSON OUTPUT:\n"
-                f"{json_str}\n"
-                "```"
-            )
-
-        with open(dst, "r") as f:
-            toon_str = f.read()
-
+        if toon_encode is not None:
+            toon_str = toon_encode(safe)
+        else:
+            toon_str = _toon_via_cli(json_str)
     except Exception as e:
+        if json_str is None:
+            json_str = _json_dumps(safe)
         return (
             "```error\n"
-            f"TOON subprocess error:\n{e}\n\n"
+            f"TOON conversion error:\n{e}\n\n"
             "JSON OUTPUT:\n"
             f"{json_str}\n"
             "```"
@@ -135,8 +353,23 @@ def toon_with_stats(data: Any) -> str:
     # ------------------------------------------------------------------
     # Token savings (FORCED INTO TOOL OUTPUT)
     # ------------------------------------------------------------------
-    json_tokens = count_tokens(json_str)
-    toon_tokens = count_tokens(toon_str)
+    # The stats are cosmetic — skip the encode cost when INFO logging is
+    # off, or when the payload is too small / the byte savings too thin
+    # (< 3%) for the numbers to be worth computing.
+    if _REPORT_TOKENS and logger.isEnabledFor(logging.INFO) and json_str is None:
+        json_str = _json_dumps(safe)
+
+    if (
+        _REPORT_TOKENS
+        and logger.isEnabledFor(logging.INFO)
+        and len(json_str) >= 2048
+        and (len(json_str) - len(toon_str)) * 100 // len(json_str) >= 3
+    ):
+        json_tokens, toon_tokens = await asyncio.gather(
+            _count_or_estimate(json_str), _count_or_estimate(toon_str)
+        )
+    else:
+        json_tokens = toon_tokens = -1
 
     if json_tokens > 0 and toon_tokens > 0:
         reduction = 100 * (1 - (toon_tokens / json_tokens))
@@ -146,6 +379,9 @@ def toon_with_stats(data: Any) -> str:
             f"- TOON tokens: {toon_tokens}\n"
             f"- Saved: {reduction:.1f}%\n"
         )
+    elif not _REPORT_TOKENS:
+        # Reporting is off — drop the section instead of shipping filler.
+        savings_text = ""
     else:
         savings_text = "\n\n# Token Savings\n(unavailable)\n"
 
@@ -158,22 +394,129 @@ def toon_with_stats(data: Any) -> str:
 # ================================================================
 # PYATS DEVICE HELPERS
 # ================================================================
+_testbed_cache = None
+_testbed_mtime = None
+
+
+def _load_testbed():
+    """Return the parsed testbed, re-reading the YAML only when it changes on disk."""
+    global _testbed_cache, _testbed_mtime
+    mtime = os.stat(TESTBED_PATH).st_mtime
+    if _testbed_cache is None or mtime != _testbed_mtime:
+        logger.info(f"Loading testbed from {TESTBED_PATH}")
+        _testbed_cache = loader.load(TESTBED_PATH)
+        _testbed_mtime = mtime
+    return _testbed_cache
+
+
+# Pool policy: drop sessions nobody has used for a while, and recycle
+# even busy ones past a maximum age so stuck transports cannot live forever.
+_POOL_IDLE_TIMEOUT = float(os.getenv("CONNECTION_POOL_IDLE_TIMEOUT", "300"))
+_POOL_MAX_AGE = float(os.getenv("CONNECTION_POOL_MAX_AGE", "3600"))
+
+
+class DevicePool:
+    """Live device sessions keyed by name, reused across tool calls.
+
+    Guarded by a threading.Lock because entries are touched both from the
+    event loop and from executor threads.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, device_name: str):
+        """Return the pooled device, registering it on first use."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(device_name)
+            if entry is None:
+                device = _load_testbed().devices.get(device_name)
+                if not device:
+                    raise ValueError(f"Device '{device_name}' not in testbed")
+                entry = {"device": device, "created": now, "last_used": now}
+                self._entries[device_name] = entry
+            entry["last_used"] = now
+            return entry["device"]
+
+    def connected_devices(self):
+        with self._lock:
+            return [
+                (name, entry["device"])
+                for name, entry in self._entries.items()
+                if entry["device"].is_connected()
+            ]
+
+    def expired_names(self):
+        """Names of sessions that idled out or exceeded max age."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                name for name, entry in self._entries.items()
+                if (now - entry["last_used"] > _POOL_IDLE_TIMEOUT
+                    or now - entry["created"] > _POOL_MAX_AGE)
+            ]
+
+    def evict_if_expired(self, name: str):
+        """Disconnect and drop one session if it is still expired.
+
+        The caller must hold the device's lock so no command is in flight;
+        the expiry is re-checked because the device may have been used
+        while the reaper waited for that lock.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return
+            if (now - entry["last_used"] <= _POOL_IDLE_TIMEOUT
+                    and now - entry["created"] <= _POOL_MAX_AGE):
+                return
+            self._entries.pop(name)
+        logger.info(f"♻️ Evicting pooled session for {name}")
+        _disconnect_device(entry["device"])
+
+    def disconnect_all(self):
+        with self._lock:
+            devices = [entry["device"] for entry in self._entries.values()]
+            self._entries.clear()
+        for device in devices:
+            _disconnect_device(device)
+
+
+_DEVICE_POOL = DevicePool()
+
+
+def _connect_device(device, learn_hostname: bool):
+    device.connect(
+        connection_timeout=int(os.getenv("PYATS_CONNECT_TIMEOUT", "30")),
+        learn_hostname=learn_hostname,
+        log_stdout=False,
+        mit=True,
+    )
+
+
 def _get_device(device_name: str):
     try:
-        testbed = loader.load(TESTBED_PATH)
-        device = testbed.devices.get(device_name)
-        if not device:
-            raise ValueError(f"Device '{device_name}' not in testbed")
+        device = _DEVICE_POOL.get(device_name)
 
         if not device.is_connected():
             logger.info(f"🔌 Connecting to {device_name}…")
-            device.connect(
-                connection_timeout=120,
-                learn_hostname=True,
-                log_stdout=False,
-                mit=True,
-            )
+            _connect_device(device, learn_hostname=True)
             logger.info(f"✅ Connected to {device_name}")
+            return device
+
+        # Pooled session — cheap liveness probe. On a stale transport,
+        # reconnect without re-learning the already-known prompt.
+        try:
+            device.execute("\n")
+        except Exception as probe_exc:
+            logger.warning(
+                f"Stale session for {device_name} ({probe_exc}); reconnecting…"
+            )
+            _disconnect_device(device)
+            _connect_device(device, learn_hostname=False)
 
         return device
 
@@ -191,70 +534,310 @@ def _disconnect_device(device):
             logger.warning(f"Disconnect error {device.name}: {e}")
 
 
+def _shutdown_all_devices():
+    _DEVICE_POOL.disconnect_all()
+
+
+atexit.register(_shutdown_all_devices)
+
+
+# Deletion table covering the latin-1 range — device CLI output is ASCII.
+_NON_PRINTABLE_TABLE = dict.fromkeys(
+    i for i in range(256) if chr(i) not in string.printable
+)
+
+_ANSI_ESCAPE_RE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+
+# Leading indent of every non-blank line — used by the regex dedent below.
+_LEADING_WS_RE = re.compile(r"(?m)^([ \t]*)(?=\S)")
+_BLANK_LINE_RE = re.compile(r"(?m)^[ \t]+$")
+
+
+def _fast_dedent(text: str) -> str:
+    """Regex-based textwrap.dedent equivalent for the config push hot path."""
+    margin = min((len(i) for i in _LEADING_WS_RE.findall(text)), default=0)
+    if margin == 0:
+        return text
+    # Like textwrap.dedent, whitespace-only lines come out empty.
+    return _BLANK_LINE_RE.sub("", re.sub(rf"(?m)^[ \t]{{{margin}}}", "", text))
+
+
 def clean_output(output: str) -> str:
-    ansi_escape = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-    output = ansi_escape.sub("", output)
-    return "".join(c for c in output if c in string.printable)
+    return _ANSI_ESCAPE_RE.sub("", output).translate(_NON_PRINTABLE_TABLE)
+
+
+def _has_parser(command: str, device) -> bool:
+    """True when genie's registry has a parser for the command."""
+    try:
+        return get_parser(command, device) is not None
+    except Exception:
+        return False
 
 
 # ================================================================
 # CORE COMMAND RUNNERS
 # (merged / upgraded from your second script)
 # ================================================================
+# Device helpers spend nearly all their time blocked on SSH I/O, so the
+# pool is sized well above the CPU count — the default executor's
+# min(32, cpus + 4) cap would throttle wide fan-out.
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PYATS_THREAD_POOL_SIZE", "64")),
+    thread_name_prefix="pyats",
+)
+
+# One-slot semaphore per device — pyATS device objects are not thread-safe,
+# so concurrent tool calls against the same device must serialize.
+_DEVICE_LOCKS: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(1))
+
+# Global ceiling on in-flight device work, so a large batched tool call
+# cannot monopolize the executor.
+_MAX_CONCURRENCY = asyncio.Semaphore(int(os.getenv("PYATS_MAX_CONCURRENCY", "10")))
+
+
+async def _run_on_device(device_name: str, fn, *args) -> Dict[str, Any]:
+    """Run a blocking device helper on the shared pool, serialized per device."""
+    _ensure_background_tasks()
+    # Device lock first: callers queued behind one busy device must not sit
+    # on a global permit, or a single-device batch starves other devices.
+    async with _DEVICE_LOCKS[device_name]:
+        async with _MAX_CONCURRENCY:
+            return await asyncio.to_thread(fn, device_name, *args)
+
+
+# ----------------------------------------------------------------
+# Session keepalive: cached connections stay warm so repeat commands
+# never pay the SSH handshake again.
+# ----------------------------------------------------------------
+_KEEPALIVE_INTERVAL = int(os.getenv("PYATS_KEEPALIVE_INTERVAL", "60"))
+
+_REAPER_INTERVAL = 60
+
+_keepalive_task = None
+_reaper_task = None
+
+
+async def _keepalive_loop():
+    while True:
+        await asyncio.sleep(_KEEPALIVE_INTERVAL)
+        for name, device in _DEVICE_POOL.connected_devices():
+            try:
+                async with _DEVICE_LOCKS[name]:
+                    await asyncio.to_thread(device.execute, "\n")
+                logger.debug("Keepalive sent to %s", name)
+            except Exception as e:
+                logger.warning(f"Keepalive failed for {name}: {e}")
+
+
+async def _reaper_loop():
+    while True:
+        await asyncio.sleep(_REAPER_INTERVAL)
+        try:
+            for name in _DEVICE_POOL.expired_names():
+                # Same discipline as the keepalive: hold the device lock so
+                # an in-flight command is never disconnected underneath.
+                async with _DEVICE_LOCKS[name]:
+                    await asyncio.to_thread(_DEVICE_POOL.evict_if_expired, name)
+        except Exception as e:
+            logger.warning(f"Pool reaper error: {e}")
+
+
+_default_executor_set = False
+
+
+def _ensure_background_tasks():
+    global _keepalive_task, _reaper_task, _default_executor_set
+    if not _default_executor_set:
+        # Point asyncio.to_thread / run_in_executor(None, ...) at the same
+        # pool so nothing falls back to the small default executor.
+        asyncio.get_running_loop().set_default_executor(_EXECUTOR)
+        _default_executor_set = True
+    if _keepalive_task is None or _keepalive_task.done():
+        _keepalive_task = asyncio.create_task(_keepalive_loop())
+    if _reaper_task is None or _reaper_task.done():
+        _reaper_task = asyncio.create_task(_reaper_loop())
+
+
+# ----------------------------------------------------------------
+# Result cache for idempotent commands. A tiny LRU (256 entries) with
+# a short TTL; entries for a device are dropped as soon as a
+# configuration is applied to it. Commands whose output changes per
+# invocation are never cached.
+# ----------------------------------------------------------------
+_RESULT_CACHE_TTL = float(os.getenv("PYATS_RESULT_CACHE_TTL", "30"))
+# Reachability goes stale much faster than show output — pings only
+# coalesce rapid-fire repeats, not mask a link that just went down.
+_PING_CACHE_TTL = float(os.getenv("PYATS_PING_CACHE_TTL", "5"))
+_RESULT_CACHE_MAX = 256
+_RESULT_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+# The cache is touched from executor threads (get/store in the device
+# helpers, invalidate after a config push), so every access takes this lock.
+_RESULT_CACHE_LOCK = threading.Lock()
+_UNCACHEABLE_PREFIXES = (
+    "show clock", "show process", "show interface", "show logging",
+)
+
+
+def _cache_ttl(command: str) -> float:
+    return _PING_CACHE_TTL if command.lower().startswith("ping") else _RESULT_CACHE_TTL
+
+
+def _cacheable(command: str) -> bool:
+    return _cache_ttl(command) > 0 and not command.lower().startswith(_UNCACHEABLE_PREFIXES)
+
+
+def _result_cache_get(device_name: str, command: str):
+    if not _cacheable(command):
+        return None
+    key = (device_name, command)
+    with _RESULT_CACHE_LOCK:
+        entry = _RESULT_CACHE.get(key)
+        if entry and time.monotonic() - entry[0] < _cache_ttl(command):
+            _RESULT_CACHE.move_to_end(key)
+            logger.info(f"Result cache hit for '{command}' on {device_name}")
+            return entry[1]
+    return None
+
+
+def _result_cache_store(device_name: str, command: str, result: Dict[str, Any]):
+    if _cacheable(command) and result.get("status") in ("completed", "completed_raw"):
+        key = (device_name, command)
+        with _RESULT_CACHE_LOCK:
+            _RESULT_CACHE[key] = (time.monotonic(), result)
+            _RESULT_CACHE.move_to_end(key)
+            while len(_RESULT_CACHE) > _RESULT_CACHE_MAX:
+                _RESULT_CACHE.popitem(last=False)
+
+
+def _result_cache_invalidate(device_name: str):
+    with _RESULT_CACHE_LOCK:
+        for key in [k for k in _RESULT_CACHE if k[0] == device_name]:
+            del _RESULT_CACHE[key]
+
+
+_DISALLOWED_MODIFIERS = frozenset({
+    "include", "exclude", "begin", "redirect",
+    "config", "copy", "delete", "erase", "reload", "write",
+})
+
+# Pipe/redirect characters often arrive glued to a token ("sh run|inc foo"),
+# which a split-based check misses — catch them anywhere in the command.
+_FORBIDDEN_CHARS_RE = re.compile(r"[|<>]")
+
+
 async def run_show_command_async(device_name: str, command: str) -> Dict[str, Any]:
     """Execute a show command on a device with safety checks."""
     try:
-        disallowed_modifiers = [
-            "|", "include", "exclude", "begin", "redirect",
-            ">", "<", "config", "copy", "delete", "erase", "reload", "write"
-        ]
         command_lower = command.lower().strip()
 
         if not command_lower.startswith("show"):
             return {"status": "error", "error": f"Command '{command}' is not a 'show' command."}
 
-        for part in command_lower.split():
-            if part in disallowed_modifiers:
-                return {
-                    "status": "error",
-                    "error": f"Command '{command}' contains disallowed term '{part}'."
-                }
+        match = _FORBIDDEN_CHARS_RE.search(command_lower)
+        if match:
+            return {
+                "status": "error",
+                "error": f"Command '{command}' contains disallowed term '{match.group()}'."
+            }
 
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None, partial(_execute_show_command, device_name, command)
-        )
-        return result
+        blocked = _DISALLOWED_MODIFIERS.intersection(command_lower.split())
+        if blocked:
+            return {
+                "status": "error",
+                "error": f"Command '{command}' contains disallowed term '{sorted(blocked)[0]}'."
+            }
+
+        return await _run_on_device(device_name, _execute_show_command, command)
 
     except Exception as e:
         logger.error(f"Error in run_show_command_async: {e}", exc_info=True)
         return {"status": "error", "error": f"Execution error: {e}"}
 
 
+# Show commands with a model-driven equivalent. When the testbed defines a
+# NETCONF connection for the device, these are served as structured data
+# straight from the YANG subtree instead of CLI screen-scraping + parsing.
+_YANG_MAP = {
+    "show interfaces": "/ietf-interfaces:interfaces-state",
+    "show ip interface brief": "/ietf-interfaces:interfaces-state",
+}
+
+_MODEL_DRIVEN_OSES = frozenset({"iosxe", "iosxr", "nxos"})
+
+
+def _try_structured_get(device, command: str):
+    """Fetch a command's YANG subtree over NETCONF; None means fall back to CLI."""
+    if xmltodict is None:
+        return None
+    xpath = _YANG_MAP.get(command.lower().strip())
+    if xpath is None:
+        return None
+    if getattr(device, "os", None) not in _MODEL_DRIVEN_OSES:
+        return None
+    if "netconf" not in getattr(device, "connections", {}):
+        return None
+
+    try:
+        if not device.is_connected(alias="nc"):
+            logger.info(f"🔌 Connecting to {device.name} via NETCONF…")
+            device.connect(alias="nc", via="netconf", log_stdout=False)
+
+        reply = device.nc.get(filter=("xpath", xpath))
+        # Structured dict, not the XML string — raw XML would ship the
+        # whole blob verbatim and defeat the TOON encoding.
+        parsed = xmltodict.parse(reply.data_xml).get("data") or {}
+        logger.info(f"Served '{command}' on {device.name} via NETCONF ({xpath})")
+        return {"status": "completed", "device": device.name, "output": parsed}
+    except Exception as e:
+        logger.warning(
+            f"NETCONF fetch failed for '{command}' on {device.name}: {e}. "
+            "Falling back to CLI."
+        )
+        return None
+
+
 def _execute_show_command(device_name: str, command: str) -> Dict[str, Any]:
     """Synchronous helper for show command execution."""
     device = None
     try:
+        cached = _result_cache_get(device_name, command)
+        if cached is not None:
+            return cached
+
         device = _get_device(device_name)
 
-        try:
-            logger.info(f"Attempting to parse command: '{command}' on {device_name}")
-            parsed_output = device.parse(command)
-            logger.info(f"Successfully parsed output for '{command}' on {device_name}")
-            return {"status": "completed", "device": device_name, "output": parsed_output}
-        except Exception as parse_exc:
-            logger.warning(
-                f"Parsing failed for '{command}' on {device_name}: {parse_exc}. Falling back to execute."
-            )
-            raw_output = device.execute(command)
-            logger.info(f"Executed command (fallback): '{command}' on {device_name}")
-            return {"status": "completed_raw", "device": device_name, "output": raw_output}
+        structured = _try_structured_get(device, command)
+        if structured is not None:
+            _result_cache_store(device_name, command, structured)
+            return structured
+
+        # Run the command once; a failed parse reuses the captured output
+        # instead of sending the command to the device a second time.
+        raw_output = device.execute(command)
+
+        # Cheap registry lookup first — skips the exception/traceback
+        # machinery device.parse would raise for commands with no parser.
+        if _has_parser(command, device):
+            try:
+                logger.info(f"Attempting to parse command: '{command}' on {device_name}")
+                parsed_output = device.parse(command, output=raw_output)
+                logger.info(f"Successfully parsed output for '{command}' on {device_name}")
+                result = {"status": "completed", "device": device_name, "output": parsed_output}
+            except Exception as parse_exc:
+                logger.warning(
+                    f"Parsing failed for '{command}' on {device_name}: {parse_exc}. Returning raw output."
+                )
+                result = {"status": "completed_raw", "device": device_name, "output": raw_output}
+        else:
+            logger.info(f"No parser for '{command}' on {device_name}; returning raw output")
+            result = {"status": "completed_raw", "device": device_name, "output": raw_output}
+
+        _result_cache_store(device_name, command, result)
+        return result
 
     except Exception as e:
         logger.error(f"Error executing show command: {e}", exc_info=True)
         return {"status": "error", "error": f"Execution error: {e}"}
-    finally:
-        _disconnect_device(device)
 
 
 async def apply_device_configuration_async(device_name: str, config_commands: str) -> Dict[str, Any]:
@@ -267,11 +850,7 @@ async def apply_device_configuration_async(device_name: str, config_commands: st
                 "error": "Potentially dangerous command detected (erase). Operation aborted."
             }
 
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None, partial(_execute_config, device_name, config_commands)
-        )
-        return result
+        return await _run_on_device(device_name, _execute_config, config_commands)
 
     except Exception as e:
         logger.error(f"Error in apply_device_configuration_async: {e}", exc_info=True)
@@ -284,13 +863,15 @@ def _execute_config(device_name: str, config_commands: str) -> Dict[str, Any]:
     try:
         device = _get_device(device_name)
 
-        cleaned_config = textwrap.dedent(config_commands.strip())
+        cleaned_config = _fast_dedent(config_commands.strip())
         if not cleaned_config:
             return {"status": "error", "error": "Empty configuration provided."}
 
         logger.info(f"Applying configuration on {device_name}:\n{cleaned_config}")
         output = device.configure(cleaned_config)
         logger.info(f"Configuration result on {device_name}: {output}")
+        # The device state just changed — cached show output is stale.
+        _result_cache_invalidate(device_name)
         return {
             "status": "success",
             "message": f"Configuration applied on {device_name}.",
@@ -300,18 +881,12 @@ def _execute_config(device_name: str, config_commands: str) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Error applying configuration: {e}", exc_info=True)
         return {"status": "error", "error": f"Configuration error: {e}"}
-    finally:
-        _disconnect_device(device)
 
 
 async def execute_learn_config_async(device_name: str) -> Dict[str, Any]:
     """Learn device configuration (via 'show run brief')."""
     try:
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None, partial(_execute_learn_config, device_name)
-        )
-        return result
+        return await _run_on_device(device_name, _execute_learn_config)
     except Exception as e:
         logger.error(f"Error in execute_learn_config_async: {e}", exc_info=True)
         return {"status": "error", "error": f"Error learning config: {e}"}
@@ -337,18 +912,12 @@ def _execute_learn_config(device_name: str) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Error learning config: {e}", exc_info=True)
         return {"status": "error", "error": f"Error learning config: {e}"}
-    finally:
-        _disconnect_device(device)
 
 
 async def execute_learn_logging_async(device_name: str) -> Dict[str, Any]:
     """Learn device logging."""
     try:
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None, partial(_execute_learn_logging, device_name)
-        )
-        return result
+        return await _run_on_device(device_name, _execute_learn_logging)
     except Exception as e:
         logger.error(f"Error in execute_learn_logging_async: {e}", exc_info=True)
         return {"status": "error", "error": f"Error learning logs: {e}"}
@@ -372,8 +941,6 @@ def _execute_learn_logging(device_name: str) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Error learning logs: {e}", exc_info=True)
         return {"status": "error", "error": f"Error learning logs: {e}"}
-    finally:
-        _disconnect_device(device)
 
 
 async def run_ping_command_async(device_name: str, command: str) -> Dict[str, Any]:
@@ -382,11 +949,7 @@ async def run_ping_command_async(device_name: str, command: str) -> Dict[str, An
         if not command.lower().strip().startswith("ping"):
             return {"status": "error", "error": f"Command '{command}' is not a 'ping' command."}
 
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None, partial(_execute_ping, device_name, command)
-        )
-        return result
+        return await _run_on_device(device_name, _execute_ping, command)
     except Exception as e:
         logger.error(f"Error in run_ping_command_async: {e}", exc_info=True)
         return {"status": "error", "error": f"Ping execution error: {e}"}
@@ -396,36 +959,39 @@ def _execute_ping(device_name: str, command: str) -> Dict[str, Any]:
     """Synchronous helper for ping execution."""
     device = None
     try:
+        cached = _result_cache_get(device_name, command)
+        if cached is not None:
+            return cached
+
         device = _get_device(device_name)
         logger.info(f"Executing ping: '{command}' on {device_name}")
 
-        try:
-            parsed_output = device.parse(command)
-            logger.info(f"Parsed ping output for '{command}' on {device_name}")
-            return {"status": "completed", "device": device_name, "output": parsed_output}
-        except Exception as parse_exc:
-            logger.warning(
-                f"Parsing ping failed for '{command}' on {device_name}: {parse_exc}. "
-                "Falling back to execute."
-            )
-            raw_output = device.execute(command)
-            logger.info(f"Executed ping (fallback): '{command}' on {device_name}")
-            return {"status": "completed_raw", "device": device_name, "output": raw_output}
+        raw_output = device.execute(command)
+        if _has_parser(command, device):
+            try:
+                parsed_output = device.parse(command, output=raw_output)
+                logger.info(f"Parsed ping output for '{command}' on {device_name}")
+                result = {"status": "completed", "device": device_name, "output": parsed_output}
+            except Exception as parse_exc:
+                logger.warning(
+                    f"Parsing ping failed for '{command}' on {device_name}: {parse_exc}. "
+                    "Returning raw output."
+                )
+                result = {"status": "completed_raw", "device": device_name, "output": raw_output}
+        else:
+            result = {"status": "completed_raw", "device": device_name, "output": raw_output}
+
+        _result_cache_store(device_name, command, result)
+        return result
     except Exception as e:
         logger.error(f"Error executing ping: {e}", exc_info=True)
         return {"status": "error", "error": f"Ping execution error: {e}"}
-    finally:
-        _disconnect_device(device)
 
 
 async def run_linux_command_async(device_name: str, command: str) -> Dict[str, Any]:
     """Execute a Linux command on a device."""
     try:
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None, partial(_execute_linux_command, device_name, command)
-        )
-        return result
+        return await _run_on_device(device_name, _execute_linux_command, command)
     except Exception as e:
         logger.error(f"Error in run_linux_command_async: {e}", exc_info=True)
         return {"status": "error", "error": f"Linux command execution error: {e}"}
@@ -433,50 +999,27 @@ async def run_linux_command_async(device_name: str, command: str) -> Dict[str, A
 
 def _execute_linux_command(device_name: str, command: str) -> Dict[str, Any]:
     """Synchronous helper for Linux command execution."""
-    device = None
     try:
-        logger.info("Loading testbed…")
-        testbed = loader.load(TESTBED_PATH)
-
-        if device_name not in testbed.devices:
-            return {"status": "error", "error": f"Device '{device_name}' not found in testbed."}
-
-        device = testbed.devices[device_name]
-
-        if not device.is_connected():
-            logger.info(f"Connecting to {device_name} via SSH…")
-            device.connect()
+        device = _get_device(device_name)
 
         if ">" in command or "|" in command:
             logger.info(f"Detected redirection or pipe in command: {command}")
             command = f'sh -c "{command}"'
 
-        try:
-            parser = get_parser(command, device)
-            if parser:
+        output = device.execute(command)
+        if _has_parser(command, device):
+            try:
                 logger.info(f"Parsing output for command: {command}")
-                output = device.parse(command)
-            else:
-                raise ValueError("No parser available")
-        except Exception as e:
-            logger.warning(
-                f"No parser found for command: {command}. Using `execute` instead. Error: {e}"
-            )
-            output = device.execute(command)
-
-        logger.info(f"Disconnecting from {device_name}…")
-        device.disconnect()
+                output = device.parse(command, output=output)
+            except Exception as e:
+                logger.warning(
+                    f"Parsing failed for command: {command}. Returning raw output. Error: {e}"
+                )
 
         return {"status": "completed", "device": device_name, "output": output}
     except Exception as e:
         logger.error(f"Error executing Linux command: {e}", exc_info=True)
         return {"status": "error", "error": str(e)}
-    finally:
-        if device and device.is_connected():
-            try:
-                device.disconnect()
-            except Exception:
-                pass
 
 
 # ================================================================
@@ -492,7 +1035,38 @@ async def pyats_run_show_command(device_name: str, command: str) -> str:
     Returns TOON + token savings.
     """
     result = await run_show_command_async(device_name, command)
-    return toon_with_stats(result)
+    return await toon_with_stats(result)
+
+
+@mcp.tool()
+async def pyats_run_show_commands_batch(requests: list) -> str:
+    """
+    Execute multiple Cisco IOS/NX-OS 'show' commands in parallel.
+    Each entry is {"device_name": "...", "command": "..."} — commands on
+    different devices overlap, commands on one device serialize.
+    Returns TOON + token savings.
+    """
+    async def _invalid_entry(entry) -> Dict[str, Any]:
+        return {
+            "status": "error",
+            "error": (
+                f"Invalid batch entry {entry!r}: expected an object with "
+                "'device_name' and 'command'."
+            ),
+        }
+
+    tasks = [
+        run_show_command_async(req.get("device_name", ""), req.get("command", ""))
+        if isinstance(req, dict) else _invalid_entry(req)
+        for req in requests
+    ]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    combined = [
+        result if not isinstance(result, BaseException)
+        else {"status": "error", "error": str(result)}
+        for result in results
+    ]
+    return await toon_with_stats({"status": "completed", "results": combined})
 
 
 @mcp.tool()
@@ -502,7 +1076,7 @@ async def pyats_configure_device(device_name: str, config_commands: str) -> str:
     Returns TOON + token savings.
     """
     result = await apply_device_configuration_async(device_name, config_commands)
-    return toon_with_stats(result)
+    return await toon_with_stats(result)
 
 
 @mcp.tool()
@@ -512,7 +1086,7 @@ async def pyats_show_running_config(device_name: str) -> str:
     Returns TOON + token savings.
     """
     result = await execute_learn_config_async(device_name)
-    return toon_with_stats(result)
+    return await toon_with_stats(result)
 
 
 @mcp.tool()
@@ -522,7 +1096,7 @@ async def pyats_show_logging(device_name: str) -> str:
     Returns TOON + token savings.
     """
     result = await execute_learn_logging_async(device_name)
-    return toon_with_stats(result)
+    return await toon_with_stats(result)
 
 
 @mcp.tool()
@@ -532,7 +1106,7 @@ async def pyats_ping_from_network_device(device_name: str, command: str) -> str:
     Returns TOON + token savings.
     """
     result = await run_ping_command_async(device_name, command)
-    return toon_with_stats(result)
+    return await toon_with_stats(result)
 
 
 @mcp.tool()
@@ -542,12 +1116,33 @@ async def pyats_run_linux_command(device_name: str, command: str) -> str:
     Returns TOON + token savings.
     """
     result = await run_linux_command_async(device_name, command)
-    return toon_with_stats(result)
+    return await toon_with_stats(result)
 
 
 # ================================================================
 # MAIN
 # ================================================================
+def _warm_start():
+    """Prime the testbed cache and genie parser registry at startup so the
+    first tool call doesn't pay their one-time import cost."""
+    try:
+        testbed = _load_testbed()
+        device = next(iter(testbed.devices.values()), None)
+        if device is not None:
+            get_parser("show version", device)
+        logger.info("🔥 Warm-up complete: testbed and parser registry loaded")
+    except Exception as e:
+        logger.warning(f"Warm-up skipped: {e}")
+
+
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+        logger.info("⚡ uvloop installed as the event loop policy")
+    except ImportError:
+        pass
+
     logger.info("🚀 Starting pyATS FastMCP Server with TOON enabled…")
+    _warm_start()
     mcp.run()